@@ -1,12 +1,26 @@
 # agents/__init__.py
-from .models import AgentCapability
-from .base import Agent
-from .director import AgentDirector
-from .setup import setup_agent_system
+# Submodules are loaded lazily (PEP 562) so `import agents` doesn't pull
+# pydantic, yaml, and the tool registry until something is actually used —
+# this keeps cold-start import time down for CLI runs.
+
+_EXPORTS = {
+    'AgentCapability': '.models',
+    'Agent': '.base',
+    'AgentDirector': '.director',
+    'setup_agent_system': '.setup',
+}
 
 __all__ = [
     'AgentCapability',
     'Agent',
     'AgentDirector',
     'setup_agent_system'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(module_name, __name__), name)
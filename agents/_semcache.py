@@ -0,0 +1,61 @@
+# agents/_semcache.py
+from typing import Optional, Any
+from collections import OrderedDict
+from time import monotonic
+
+
+class SemanticResponseCache:
+    """Cache for parsed LLM responses keyed by normalized prompt text.
+
+    Prompts are casefolded and whitespace-collapsed before lookup, so
+    trivially rephrased requests (extra spacing, capitalization) still hit
+    the same entry instead of paying for another LLM round trip. Entries
+    are evicted LRU-style once `max_entries` is reached and expire after
+    `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _make_key(prompt: str, model_name: str) -> str:
+        return f"{model_name}:{' '.join(prompt.casefold().split())}"
+
+    async def get(self, prompt: str, model_name: str) -> Optional[str]:
+        """Get the cached serialized response, or None on a miss"""
+        key = self._make_key(prompt, model_name)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, payload = entry
+        if monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    async def put(self, prompt: str, model_name: str, parsed_obj: Any) -> None:
+        """Store a parsed response model, serialized for later revalidation"""
+        key = self._make_key(prompt, model_name)
+        self._entries[key] = (monotonic(), parsed_obj.model_dump_json())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses and reset counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+response_cache = SemanticResponseCache()
@@ -1,12 +1,36 @@
 # agents/base.py
+import ast
+import asyncio
+import io
+import logging
 from typing import List, Dict, Optional, Any, Union
-from pydantic import BaseModel, Field
+from collections import deque
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer
 from tools.toolbox import tool_registry
 from .models import ConversationTurn, AgentCapability
+from ._semcache import response_cache
 from schemas.resp_formats import TaskAnalysis, FinalResponse, CodeResponse
-from prompt_templates.response_prompts import assign_tool_prompt, summarize_final_response, generate_code, handle_code_error
+from prompt_templates.response_prompts import (
+    render,
+    assign_tool_system,
+    assign_tool_user,
+    summarize_final_system,
+    summarize_final_user,
+    generate_code_system,
+    generate_code_user,
+    handle_code_error_system,
+    handle_code_error_user
+)
 from utilities.errors import LLMConnectionError, LLMValidationError, LLMResponseError, ToolNotFoundError, ToolValidationError, ToolExecutionError
 from datetime import datetime
+from hashlib import blake2b
+
+logger = logging.getLogger(__name__)
+
+# The director runs several tasks concurrently and each one may stream
+# its summary; without serialization their token streams interleave
+# character-by-character on the console
+_stream_lock = asyncio.Lock()
 
 class Agent(BaseModel):
     """Unified agent that handles task execution"""
@@ -15,8 +39,13 @@ class Agent(BaseModel):
     capabilities: List[AgentCapability]
     tools: Optional[List[Dict]] = None
     max_history: int = Field(default=50)
-    history: List[ConversationTurn] = Field(default_factory=list)
+    history: Any = Field(default_factory=lambda: deque(maxlen=50))
     llm: Any = None
+    _available_types: set = PrivateAttr(default_factory=set)
+    _cap_by_name: Dict[str, AgentCapability] = PrivateAttr(default_factory=dict)
+    _function_types: frozenset = PrivateAttr(default=frozenset())
+    _num_caps: int = PrivateAttr(default=0)
+    _analyze_system_cache: Optional[tuple] = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
@@ -24,57 +53,98 @@ class Agent(BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.tools = self.tools or []
+        # A bounded deque drops the oldest turn on append, so history
+        # trimming is O(1) instead of re-slicing the list each turn
+        self.history = deque(self.history or [], maxlen=self.max_history)
+        # Index capabilities once; they don't change after construction
+        self._cap_by_name = {cap.name: cap for cap in self.capabilities}
+        self._function_types = frozenset(
+            ft for cap in self.capabilities for ft in cap.function_types
+        )
+        self._num_caps = len(self.capabilities)
+        self._refresh_available_types()
+
+    @field_serializer('history')
+    def _serialize_history(self, history: Any) -> List[ConversationTurn]:
+        """Serialize the history deque as a plain list"""
+        return list(history)
 
     def add_tools(self, tools: List[Dict]):
         """Add tools to the agent"""
         self.tools = tools
+        self._refresh_available_types()
         return self
 
+    def _refresh_available_types(self) -> None:
+        """Precompute the function types our tools provide"""
+        self._available_types = {
+            config.get("function_type")
+            for tool in self.tools
+            if (config := tool_registry.get_tool_config(tool["name"]))
+        }
+
+    async def _cached_chat(self, prompt: str, response_model: Any, system: Optional[str] = None) -> Any:
+        """Check the semantic cache before paying for an LLM round trip"""
+        cache_key = prompt if system is None else f"{system}\n{prompt}"
+        cached = await response_cache.get(cache_key, response_model.__name__)
+        if cached is not None:
+            return response_model.model_validate_json(cached)
+
+        response = await self.llm.chat(
+            role="user",
+            content=prompt,
+            response_model=response_model,
+            system=system
+        )
+        await response_cache.put(cache_key, response_model.__name__, response)
+        return response
+
 
     async def execute_task_and_format(self, task: Dict[str, Any], user_input: str) -> Dict[str, Any]:
         """Execute a task and format its response"""
         try:
-            print(f"\nExecuting task: {task.get('name')}")
-            
+            logger.info("Executing task: %s", task.get('name'))
+
+            # Bind the parameters dict once instead of re-fetching it (and
+            # allocating fallback dicts) at every access below
+            params = task.setdefault('parameters', {})
+
             # If this is a code task that needs code generation
             if task.get('tool') == 'execute_python_code':
-                print("\nGenerating code based on task description and research...")
-                
+                logger.info("Generating code based on task description and research...")
+
                 # Get previous results if this task depends on others
-                previous_results = task.get('parameters', {}).get('previous_results', '')
+                previous_results = params.get('previous_results', '')
                 
-                # Generate code using LLM
-                code_prompt = generate_code.replace(
-                    "{{previous_results}}", str(previous_results)
-                ).replace(
-                    "{{task_description}}", task.get('description', '')
+                # Generate code using LLM; static instructions go in the
+                # system message so the provider can prefix-cache them
+                code_prompt = render(
+                    generate_code_user,
+                    previous_results=str(previous_results),
+                    task_description=task.get('description', '')
                 )
-                
+
                 try:
-                    code_response = await self.llm.chat(
-                        role="user",
-                        content=code_prompt,
-                        response_model=CodeResponse
+                    code_response = await self._cached_chat(
+                        code_prompt, CodeResponse, system=generate_code_system
                     )
                     
-                    # Add generated code to task parameters
-                    task['parameters'] = {
-                        'code': code_response.code,
-                        'timeout': task.get('parameters', {}).get('timeout', 30)
-                    }
+                    # Add generated code to task parameters in place
+                    timeout = params.get('timeout', 30)
+                    params.clear()
+                    params.update(code=code_response.code, timeout=timeout)
                     
-                    print("\nGenerated Code:")
-                    print(code_response.code)
+                    logger.debug("Generated Code:\n%s", code_response.code)
                     
                 except Exception as e:
-                    print(f"Error generating code: {str(e)}")
+                    logger.error("Error generating code: %s", str(e))
                     raise
             
             # Execute the task with potentially modified parameters
             result = await self.execute_task(task)
             
             # Format and show response
-            print("\nFormatting response...")
+            logger.info("Formatting response...")
             response = await self._format_response(result, user_input, task)
             
             # Update history
@@ -89,7 +159,7 @@ class Agent(BaseModel):
             
         except Exception as e:
             error_msg = str(e)
-            print(f"\nError executing task: {error_msg}")
+            logger.error("Error executing task: %s", error_msg)
             return {
                 'error': error_msg,
                 'status': 'error',
@@ -103,35 +173,31 @@ class Agent(BaseModel):
             agent_response=response,
             timestamp=datetime.now()
         )
-        self.history.append(turn)
-        
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        self.history.append(turn)  # maxlen evicts the oldest turn
 
     def clear_history(self) -> None:
         """Clear conversation history"""
-        self.history = []
+        self.history.clear()
 
     def can_handle_task(self, task: Dict[str, Any]) -> bool:
         """Determine if agent can handle a task"""
         if not self.tools:
             return False
-            
-        # Get required function types for this task
-        task_capabilities = task.get("required_capabilities", [])
+
+        # No required capabilities means any tooled agent qualifies
+        task_capabilities = task.get("required_capabilities")
+        if not task_capabilities:
+            return True
+
+        # Get required function types for this task from the name index
         required_types = set()
-        for cap in self.capabilities:
-            if cap.name in task_capabilities:
-                required_types.update(cap.function_types)
-        
-        # Get available function types from our tools
-        available_types = {
-            config.get("function_type") 
-            for tool in self.tools 
-            if (config := tool_registry.get_tool_config(tool["name"]))
-        }
-        
-        return all(req_type in available_types for req_type in required_types)
+        for cap_name in task_capabilities:
+            capability = self._cap_by_name.get(cap_name)
+            if capability:
+                required_types.update(capability.function_types)
+
+        # Use the function types precomputed from our tools
+        return required_types.issubset(self._available_types)
 
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a task using the tool chosen by LLM"""
@@ -139,51 +205,62 @@ class Agent(BaseModel):
         try:
             tool_name = task["tool"]
             
-            # Clean up parameters based on tool type
+            # Clean up parameters based on tool type via set intersection
+            # with the registry's precomputed parameter-name frozenset
             tool_config = tool_registry.get_tool_config(tool_name)
-            valid_params = tool_config.get("parameters", {}).keys()
-            cleaned_parameters = {
-                k: v for k, v in task.get("parameters", {}).items() 
-                if k in valid_params
-            }
+            valid_params = tool_config.get("_valid_params_fs") or frozenset(tool_config.get("parameters", {}))
+            params = task.setdefault("parameters", {})
+            cleaned_parameters = {k: params[k] for k in params.keys() & valid_params}
             
-            print("TOOL NAME: ", tool_name)
-            print("CLEANED PARAMETERS: ", cleaned_parameters)
+            # Syntax-check generated code in-process before paying for a
+            # tool execution; repair from the SyntaxError immediately
+            if "code" in cleaned_parameters:
+                try:
+                    ast.parse(cleaned_parameters["code"])
+                except SyntaxError as se:
+                    logger.warning("Syntax error in generated code: %s", se)
+                    prompt = render(
+                        handle_code_error_user,
+                        error_message=str(se),
+                        code=cleaned_parameters["code"],
+                        task_description=task.get("description", "")
+                    )
+                    repair_response = await self._cached_chat(
+                        prompt, CodeResponse, system=handle_code_error_system
+                    )
+                    cleaned_parameters["code"] = repair_response.code
+
+            logger.debug("Tool name: %s", tool_name)
+            logger.debug("Cleaned parameters: %s", cleaned_parameters)
             
             try:
-                print(f"\nExecuting {tool_name}...")
+                logger.info("Executing %s...", tool_name)
                 if "code" in cleaned_parameters:
-                    print("\nExecuting code...")
-                    print("Code to execute:")
-                    print(cleaned_parameters["code"])
+                    logger.debug("Code to execute:\n%s", cleaned_parameters["code"])
                 
                 # Execute tool
                 result = await tool_registry.execute_tool(tool_name, cleaned_parameters)
                 if "code" in cleaned_parameters and "Error" in str(result):
-                    print("CALLING REPAIR ERROR")
-                    prompt = handle_code_error.replace(
-                        "{{error_message}}", str(result)
-                    ).replace(
-                        "{{code}}", cleaned_parameters["code"]
-                    ).replace(
-                        "{{task_description}}", task.get("description", "")
+                    logger.info("Tool output contained an error, repairing code")
+                    prompt = render(
+                        handle_code_error_user,
+                        error_message=str(result),
+                        code=cleaned_parameters["code"],
+                        task_description=task.get("description", "")
                     )
-                    
-                    repair_response = await self.llm.chat(
-                        role="user",
-                        content=prompt,
-                        response_model=CodeResponse
+
+                    repair_response = await self._cached_chat(
+                        prompt, CodeResponse, system=handle_code_error_system
                     )
 
                     repaired_code = repair_response.code
-                    print("REPAIRED CODE: ", repaired_code)
+                    logger.debug("Repaired code:\n%s", repaired_code)
                 
                     # Execute the repaired code
                     cleaned_parameters["code"] = repaired_code
                     result = await tool_registry.execute_tool(tool_name, cleaned_parameters)
 
-                print("\nTool Output:")
-                print(result)
+                logger.debug("Tool output:\n%s", result)
                 
                 results.append({
                     "tool": tool_name,
@@ -215,31 +292,35 @@ class Agent(BaseModel):
     async def _analyze_task(self, task_input: str) -> Dict[str, Any]:
         """Use LLM to analyze task and determine required tools and parameters"""
         try:
-            # Get available tools and their capabilities
-            available_tools = tool_registry.list_tools()
-            tools_info = []
-            for name, config in available_tools.items():
-                tools_info.append(f"""
-                    Tool: {name}
-                    Description: {config['description']}
-                    Type: {config['function_type']}
-                    Parameters: {', '.join(config['parameters'].keys())}
-                    """)
-
-            # Create prompt for LLM
-            prompt = assign_tool_prompt.replace("{{tools_info}}", "\n".join(tools_info)).replace("{{task_input}}", task_input)
+            # Render the tool catalog into the system prompt once per
+            # registry version; the string work is pure overhead otherwise
+            if self._analyze_system_cache and self._analyze_system_cache[0] == tool_registry.version:
+                system = self._analyze_system_cache[1]
+            else:
+                available_tools = tool_registry.list_tools()
+                tools_info = []
+                for name, config in available_tools.items():
+                    tools_info.append(f"""
+                        Tool: {name}
+                        Description: {config['description']}
+                        Type: {config['function_type']}
+                        Parameters: {', '.join(config['parameters'].keys())}
+                        """)
+
+                # Static tool catalog goes in the system message for prefix
+                # caching; only the task input changes between calls
+                system = render(assign_tool_system, tools_info="\n".join(tools_info))
+                self._analyze_system_cache = (tool_registry.version, system)
+
+            prompt = render(assign_tool_user, task_input=task_input)
 
             try:
                 # Get LLM's analysis
-                response = await self.llm.chat(
-                    role="user",
-                    content=prompt,
-                    response_model=TaskAnalysis
-                )
+                response = await self._cached_chat(prompt, TaskAnalysis, system=system)
 
                 # Map to task format
                 return {
-                    "id": str(hash(task_input)),
+                    "id": blake2b(task_input.encode("utf-8"), digest_size=8).hexdigest(),
                     "name": response.tool_name,
                     "parameters": response.parameters
                 }
@@ -257,68 +338,86 @@ class Agent(BaseModel):
     async def _format_response(self, result: Dict[str, Any], user_input: str, task) -> str:
         """Format task results into natural language response with error handling"""
         try:
-            # Collect all results
-            output_sections = []
-            output_sections.append("=== Task Analysis ===")
-            output_sections.append(f"Input: {user_input}")
-            output_sections.append("")
+            # Write sections straight into a string buffer instead of
+            # growing a list one append at a time per tool run
+            buf = io.StringIO()
+            w = buf.write
+            w(f"=== Task Analysis ===\nInput: {user_input}\n\n")
 
-            
-            output_sections.append("After analysis, I have identified the following tasks to complete:")
-            output_sections.append(f"Task: {task.get('name', 'Unknown task')}")
-            output_sections.append(f"Tool: {task.get('name')}")
+            w("After analysis, I have identified the following tasks to complete:\n")
+            w(f"Task: {task.get('name', 'Unknown task')}\n")
+            w(f"Tool: {task.get('name')}\n")
             if task.get('parameters'):
-                output_sections.append("Parameters:")
-                for param, value in task['parameters'].items():
-                    output_sections.append(f"  {param}: {value}")
-            output_sections.append("")
+                w("Parameters:\n")
+                w("\n".join(
+                    f"  {param}: {value}"
+                    for param, value in task['parameters'].items()
+                ))
+                w("\n")
+            w("\n")
 
             for r in result.get("results", []):
-                output_sections.append(f"=== Executing Tool: {r.get('tool', 'unknown')} ===")
-                
+                w(f"=== Executing Tool: {r.get('tool', 'unknown')} ===\n")
+
                 # Show explanation if available
                 if r.get("explanation"):
-                    output_sections.append(f"Purpose: {r['explanation']}")
-                
+                    w(f"Purpose: {r['explanation']}\n")
+
                 # Show the actual tool results or errors
                 if r.get("success", False):
                     # Format code blocks properly
                     if isinstance(r["result"], str) and "```" in r["result"]:
-                        output_sections.append("Generated Code:")
-                        output_sections.append(r["result"])
+                        w("Generated Code:\n")
+                        w(r["result"])
+                        w("\n")
                     else:
-                        output_sections.append("Result:")
-                        output_sections.append(str(r["result"]))
+                        w(f"Result:\n{r['result']}\n")
                 else:
-                    output_sections.append(f"Error: {r.get('error', 'Unknown error occurred')}")
-                
-                output_sections.append("")  # Add spacing between sections
-                output_sections.append("=" * 30)
+                    w(f"Error: {r.get('error', 'Unknown error occurred')}\n")
+
+                w("\n")  # Add spacing between sections
+                w("=" * 30 + "\n")
             # If no successful results were found
             if not any(r.get("success", False) for r in result.get("results", [])):
-                output_sections.append("No successful results were obtained with the available tools.")
-                output_sections.append("=" * 30)
+                w("No successful results were obtained with the available tools.\n")
+                w("=" * 30 + "\n")
 
             # Turn result dict into result str
-            result = "\n".join(output_sections)
+            result = buf.getvalue()
            
-            prompt = summarize_final_response.replace("{{user_input}}", user_input).replace("{{tool_results}}", result)
+            prompt = render(summarize_final_user, user_input=user_input, tool_results=result)
 
+            # Stream the summary so text starts appearing at first-token
+            # latency; fall back to the structured call if streaming fails.
+            # The lock serializes console output across concurrent tasks —
+            # one task streams live while the others wait their turn.
             try:
-                response = await self.llm.chat(
-                    role="user",
-                    content=prompt,
-                    response_model=FinalResponse
-                )
+                async with _stream_lock:
+                    chunks = []
+                    async for chunk in self.llm.chat_stream(
+                        role="user",
+                        content=prompt,
+                        system=summarize_final_system
+                    ):
+                        print(chunk, end="", flush=True)
+                        chunks.append(chunk)
+                    if chunks:
+                        print()
+                        return "".join(chunks)
+            except Exception as e:
+                logger.warning("Streaming unavailable (%s), retrying without streaming", str(e))
+
+            try:
+                response = await self._cached_chat(prompt, FinalResponse, system=summarize_final_system)
                 return response.content
 
             except Exception as e:
-                output_sections.append("=== Summary ===")
-                output_sections.append("An error occurred while formatting the final response.")
-                output_sections.append(f"Raw results are shown above.")
-                output_sections.append("=" * 30)
+                w("=== Summary ===\n")
+                w("An error occurred while formatting the final response.\n")
+                w("Raw results are shown above.\n")
+                w("=" * 30 + "\n")
 
-            return "\n".join(output_sections)
+            return buf.getvalue()
 
         except Exception as e:
             return f"Error formatting response: {str(e)}\nRaw result: {str(result)}"
\ No newline at end of file
@@ -1,42 +1,70 @@
 # agents/director.py
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field, ConfigDict
+from hashlib import blake2b
+from collections import OrderedDict
+from copy import deepcopy
+import asyncio
+import logging
+import operator
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from schemas.resp_formats import TaskList
-from prompt_templates.response_prompts import decompose_tasks_prompt
+from prompt_templates.response_prompts import render, decompose_tasks_system, decompose_tasks_user
 from tools.toolbox import tool_registry
 from .models import AgentCapability 
 from .base import Agent
 from communications.output_manager import OutputManager
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached request decompositions before LRU eviction
+_DECOMP_CACHE_MAX = 1024
+
 
 class AgentDirector(BaseModel):
     """Coordinates multiple agents"""
     agents: List[Agent] = Field(default_factory=list)
     llm: Any = None
+    max_parallel_tasks: int = Field(default=4)
     output_manager: OutputManager = None  # Define the field
-    
+    _tools_info_cache: Optional[tuple] = PrivateAttr(default=None)
+    _agents_by_type: Dict[str, List[Agent]] = PrivateAttr(default_factory=dict)
+    _decomp_cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _capabilities_str_cache: Optional[str] = PrivateAttr(default=None)
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    
+
     def __init__(self, **data):
         super().__init__(**data)
         if self.output_manager is None:  # Initialize if not provided
             self.output_manager = OutputManager()
+        # Index any agents supplied at construction time
+        for agent in self.agents:
+            self._index_agent(agent)
 
     def register_agent(self, agent: Agent):
         """Register a new agent"""
         self.agents.append(agent)
+        self._index_agent(agent)
+        self._capabilities_str_cache = None  # New capabilities may appear
+
+    def _index_agent(self, agent: Agent) -> None:
+        """Add an agent to the function-type inverted index"""
+        for function_type in agent._function_types:
+            self._agents_by_type.setdefault(function_type, []).append(agent)
 
     async def process_request(self, request: str) -> Dict[str, Any]:
         """Process a request using appropriate agents"""
-        request_id = str(hash(request))
+        # blake2b is deterministic across processes (builtin hash() is
+        # randomized per run), so these IDs stay valid as cache/log keys
+        request_id = blake2b(request.encode("utf-8"), digest_size=8).hexdigest()
         self.output_manager.start_request(request_id)
 
         try:
             # Get tasks from request
             tasks = await self._decompose_request(request)
-            print(f"\nDecomposed into {len(tasks)} tasks:")
+            logger.info("Decomposed into %d tasks", len(tasks))
             for i, task in enumerate(tasks, 1):
-                print(f"{i}. {task.get('name')}: {task.get('description')}")
+                logger.info("%d. %s: %s", i, task.get('name'), task.get('description'))
             
             if not tasks:
                 self.output_manager.add_result(
@@ -54,52 +82,81 @@ class AgentDirector(BaseModel):
             all_results = []
             task_outputs = {}  # Store outputs for dependency handling
 
-            # Execute tasks in sequence
-            for task in tasks:
-                print(f"\n=== Executing Task: {task.get('name')} ===")
-                print(f"Description: {task.get('description')}")
-                
-                # Handle dependencies
-                if 'depends_on' in task:
-                    for dep_id in task['depends_on']:
-                        if dep_id in task_outputs:
-                            task['parameters']['previous_results'] = task_outputs[dep_id]
-
-                # Find suitable agent
-                agent = self._find_best_agent(task)
-                if agent:
-                    try:
-                        # Use new execute_task_and_format method
-                        result = await agent.execute_task_and_format(task, request)
-                        task_outputs[task['id']] = result.get('task_output')
-                        
-                        self.output_manager.add_result(
-                            task_id=task.get('id', 'unknown'),
-                            status=result.get('status', 'error'),
-                            result=result.get('task_output', []),
-                            agent_name=agent.name,
-                            error=result.get('error')
-                        )
-                        all_results.append({
-                            'task': task,
-                            'result': result,
-                            'agent': agent.name
-                        })
-                    except Exception as e:
-                        self.output_manager.add_result(
-                            task_id=task.get('id', 'unknown'),
-                            status="error",
-                            result=None,
-                            agent_name=agent.name,
-                            error=str(e)
-                        )
-                else:
-                    self.output_manager.add_result(
-                        task_id=task.get('id', 'unknown'),
-                        status="error",
-                        result=None,
-                        error="No suitable agent found"
-                    )
+            # Tasks are I/O-bound on LLM and tool calls, so run each wave
+            # of dependency-free tasks concurrently instead of strictly in
+            # sequence; the semaphore caps in-flight LLM calls
+            semaphore = asyncio.Semaphore(self.max_parallel_tasks)
+            results_lock = asyncio.Lock()
+
+            async def run_task(task):
+                async with semaphore:
+                    logger.info("=== Executing Task: %s ===", task.get('name'))
+                    logger.info("Description: %s", task.get('description'))
+
+                    # Handle dependencies
+                    if 'depends_on' in task:
+                        for dep_id in task['depends_on']:
+                            if dep_id in task_outputs:
+                                task['parameters']['previous_results'] = task_outputs[dep_id]
+
+                    # Find suitable agent
+                    agent = self._find_best_agent(task)
+                    if agent:
+                        try:
+                            # Use new execute_task_and_format method
+                            result = await agent.execute_task_and_format(task, request)
+                            task_outputs[task['id']] = result.get('task_output')
+
+                            async with results_lock:
+                                self.output_manager.add_result(
+                                    task_id=task.get('id', 'unknown'),
+                                    status=result.get('status', 'error'),
+                                    result=result.get('task_output', []),
+                                    agent_name=agent.name,
+                                    error=result.get('error')
+                                )
+                                all_results.append({
+                                    'task': task,
+                                    'result': result,
+                                    'agent': agent.name
+                                })
+                        except Exception as e:
+                            async with results_lock:
+                                self.output_manager.add_result(
+                                    task_id=task.get('id', 'unknown'),
+                                    status="error",
+                                    result=None,
+                                    agent_name=agent.name,
+                                    error=str(e)
+                                )
+                    else:
+                        async with results_lock:
+                            self.output_manager.add_result(
+                                task_id=task.get('id', 'unknown'),
+                                status="error",
+                                result=None,
+                                error="No suitable agent found"
+                            )
+
+            # Schedule tasks wave by wave: everything whose dependencies
+            # have completed runs in parallel, then the next wave unlocks
+            pending = {task['id']: task for task in tasks}
+            completed = set()
+            while pending:
+                ready = [
+                    task for task in pending.values()
+                    if all(dep in completed for dep in task.get('depends_on', []))
+                ]
+                if not ready:
+                    # Unresolvable dependencies; run the rest as a final
+                    # wave so no task is silently dropped
+                    ready = list(pending.values())
+
+                await asyncio.gather(*(run_task(task) for task in ready))
+
+                for task in ready:
+                    pending.pop(task['id'])
+                    completed.add(task['id'])
 
             summary = self.output_manager.get_summary()
             return {
@@ -123,52 +180,71 @@ class AgentDirector(BaseModel):
             }
     async def _decompose_request(self, request: str) -> List[Dict[str, Any]]:
         """Break request into tasks using LLM"""
+        # Decomposition is deterministic for repeated requests, so skip
+        # the LLM call entirely when we've already decomposed this one.
+        # The registry version in the key invalidates entries when new
+        # tools are registered.
+        cache_key = (
+            blake2b(request.encode("utf-8"), digest_size=8).hexdigest(),
+            tool_registry.version
+        )
+        cached_tasks = self._decomp_cache.get(cache_key)
+        if cached_tasks is not None:
+            self._decomp_cache.move_to_end(cache_key)
+            # Deep copy so per-task mutation (injected previous_results)
+            # doesn't corrupt the cached entry
+            return deepcopy(cached_tasks)
+
         try:
             # Get both capabilities and tools info
             available_capabilities = self._get_available_capabilities()
             available_tools = tool_registry.list_tools()
             
-            print("AVAILABLE TOOLS: ", available_tools)
-            # Format tools info
-            tools_info = []
-            for name, config in available_tools.items():
-                tools_info.append(f"""
-                    Tool: {name}
-                    Description: {config['description']}
-                    Type: {config['function_type']}
-                    Parameters: {', '.join(config['parameters'].keys())}
-                """)
-            
-            # Create comprehensive prompt
-            prompt = decompose_tasks_prompt.replace(
-                "{{query}}", request
-            ).replace(
-                "{{tools_info}}", "\n".join(tools_info)
-            )
-            
-            # Add capabilities information
-            prompt += "\n\nAvailable Agent Capabilities:\n"
-            prompt += available_capabilities
+            logger.debug("Available tools: %s", available_tools)
+            # Render the tool catalog once per registry version instead of
+            # rebuilding the per-tool strings on every request
+            if self._tools_info_cache and self._tools_info_cache[0] == tool_registry.version:
+                tools_info_str = self._tools_info_cache[1]
+            else:
+                tools_info = []
+                for name, config in available_tools.items():
+                    tools_info.append(f"""
+                        Tool: {name}
+                        Description: {config['description']}
+                        Type: {config['function_type']}
+                        Parameters: {', '.join(config['parameters'].keys())}
+                    """)
+                tools_info_str = "\n".join(tools_info)
+                self._tools_info_cache = (tool_registry.version, tools_info_str)
+
+            # Static tools/capabilities catalog goes in the system message
+            # so the provider can prefix-cache it; only the request changes
+            system = render(decompose_tasks_system, tools_info=tools_info_str)
+            system += "\n\nAvailable Agent Capabilities:\n"
+            system += available_capabilities
+
+            prompt = render(decompose_tasks_user, query=request)
 
             # Get LLM response
             response = await self.llm.chat(
                 role="user",
                 content=prompt,
-                response_model=TaskList
+                response_model=TaskList,
+                system=system
             )
 
-            print("LLM Response: ", response)
+            logger.debug("LLM Response: %s", response)
             # Add IDs and validate tasks
             tasks = []
             for i, task in enumerate(response.tasks):
-                task_dict = task.dict()
+                task_dict = task.model_dump()
                 # Add task ID if not present
                 if 'id' not in task_dict:
                     task_dict['id'] = f"task_{i}"
                 
                 # Validate tool exists
                 if task_dict.get('tool') not in available_tools:
-                    print(f"Warning: Tool {task_dict.get('tool')} not found, skipping task")
+                    logger.warning("Tool %s not found, skipping task", task_dict.get('tool'))
                     continue
                     
                 # Add capabilities based on tool type
@@ -179,43 +255,75 @@ class AgentDirector(BaseModel):
                 
                 tasks.append(task_dict)
 
+            # The LLM references dependencies by task name; translate them
+            # to the assigned task ids the scheduler keys on
+            id_by_name = {t.get('name'): t['id'] for t in tasks}
+            for t in tasks:
+                t['depends_on'] = [
+                    id_by_name[dep] for dep in t.get('depends_on', [])
+                    if dep in id_by_name
+                ]
+
+            if tasks:
+                self._decomp_cache[cache_key] = deepcopy(tasks)
+                while len(self._decomp_cache) > _DECOMP_CACHE_MAX:
+                    self._decomp_cache.popitem(last=False)
+
             return tasks
 
         except Exception as e:
-            print(f"Error decomposing request: {str(e)}")
+            logger.error("Error decomposing request: %s", str(e))
             return []
 
     def _get_capabilities_for_tool_type(self, tool_type: str) -> List[AgentCapability]:
         """Get capabilities that can handle a specific tool type"""
         matching_capabilities = []
-        for agent in self.agents:
+        for agent in self._agents_by_type.get(tool_type, []):
             for capability in agent.capabilities:
                 if tool_type in capability.function_types:
                     matching_capabilities.append(capability)
         return matching_capabilities
-            
+
     def _find_best_agent(self, task: Dict[str, Any]) -> Optional[Agent]:
         """Find the most suitable agent for a task"""
+        # Narrow candidates via the inverted index when the task's tool
+        # type is known, instead of scanning every registered agent
+        candidates = self.agents
+        tool_config = tool_registry.get_tool_config(task.get('tool'))
+        if tool_config:
+            candidates = self._agents_by_type.get(
+                tool_config.get('function_type'), self.agents
+            )
+
         suitable_agents = [
-            agent for agent in self.agents 
+            agent for agent in candidates
             if agent.can_handle_task(task)
         ]
         
         if not suitable_agents:
             return None
             
-        # If multiple agents can handle the task, prefer specialized agents over general ones
-        return min(suitable_agents, key=lambda a: len(a.capabilities))
+        # If multiple agents can handle the task, prefer specialized agents
+        # over general ones; attrgetter on the precomputed count avoids a
+        # Python lambda call per comparison
+        return min(suitable_agents, key=operator.attrgetter("_num_caps"))
 
     def _get_available_capabilities(self) -> str:
         """Get formatted string of all available capabilities"""
-        capabilities = set()
+        if self._capabilities_str_cache is not None:
+            return self._capabilities_str_cache
+
+        # Dedupe on the short capability name so shared capabilities are
+        # formatted (and hashed) once, not per agent carrying them
+        seen: Dict[str, str] = {}
         for agent in self.agents:
             for capability in agent.capabilities:
-                capabilities.add(f"""
+                if capability.name not in seen:
+                    seen[capability.name] = f"""
                 {capability.name}:
                 - Description: {capability.description}
                 - Parameters: {capability.parameters}
-                """)
-        
-        return "\n".join(capabilities)
\ No newline at end of file
+                """
+
+        self._capabilities_str_cache = "\n".join(seen.values())
+        return self._capabilities_str_cache
\ No newline at end of file
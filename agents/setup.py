@@ -1,34 +1,51 @@
 # agents/setup.py
 from typing import Dict
-import yaml
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from configurations.llm_client import LLMClient
 from tools.toolbox import tool_registry
 from .models import AgentCapability
 from .director import AgentDirector
 from .base import Agent
 
 
-def load_capabilities_config() -> Dict:
-    """Load capabilities and agent configurations"""
-    config_path = Path(__file__).parent / "config" / "capabilities.yaml"
-    
-    if not config_path.exists():
-        raise FileNotFoundError(f"Capabilities config file not found: {config_path}")
-        
+@lru_cache(maxsize=1)
+def _parse_capabilities_config(config_path: Path, mtime: float) -> Dict:
+    """Parse capabilities.yaml, cached until the file's mtime changes"""
+    import yaml  # Deferred: only needed when the config is actually loaded
+
+    # The C loader parses in a fraction of the pure-Python loader's time;
+    # fall back when PyYAML was built without libyaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
     try:
         with open(config_path) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=loader)
             return config
     except Exception as e:
         raise ValueError(f"Error loading capabilities config: {str(e)}")
 
+
+def load_capabilities_config() -> Dict:
+    """Load capabilities and agent configurations"""
+    config_path = Path(__file__).parent / "config" / "capabilities.yaml"
+
+    if not config_path.exists():
+        raise FileNotFoundError(f"Capabilities config file not found: {config_path}")
+
+    return _parse_capabilities_config(config_path, config_path.stat().st_mtime)
+
 async def setup_agent_system() -> AgentDirector:
     """Set up the agent system from configuration"""
+    # Deferred: importing the LLM client pulls openai/instructor, which
+    # is a large chunk of cold-start time if setup never runs
+    from configurations.llm_client import get_llm_client
+
     try:
         # Initialize components
         director = AgentDirector()
-        llm_client = LLMClient()
+        llm_client = get_llm_client()
         director.llm = llm_client
 
         # Load configurations
@@ -37,10 +54,19 @@ async def setup_agent_system() -> AgentDirector:
         # Get available tools and their types
         available_tools = tool_registry.list_tools()
         available_types = {
-            tool_config.get("function_type") 
+            tool_config.get("function_type")
             for tool_config in available_tools.values()
         }
 
+        # Invert the tool list by function type once, so each agent picks
+        # up its tools by key instead of re-scanning every tool
+        tools_by_type = defaultdict(list)
+        for tool_name, tool_config in available_tools.items():
+            tools_by_type[tool_config.get("function_type")].append({
+                "name": tool_name,
+                "metadata": tool_config
+            })
+
         created_agents = []
         for agent_name, agent_config in config["agents"].items():
             
@@ -76,13 +102,9 @@ async def setup_agent_system() -> AgentDirector:
                 for cap in agent_capabilities:
                     required_types.update(cap.function_types)
                     
-                agent_tools = []
-                for tool_name, tool_config in available_tools.items():
-                    if tool_config.get("function_type") in required_types:
-                        agent_tools.append({
-                            "name": tool_name,
-                            "metadata": tool_config
-                        })
+                agent_tools = list(chain.from_iterable(
+                    tools_by_type[ft] for ft in required_types
+                ))
 
                 agent.add_tools(agent_tools)
                 director.register_agent(agent)
@@ -1,52 +1,74 @@
+import asyncio
+
+import orjson
+
 from prompt_templates.response_prompts import (
+    render,
     decompose_tasks_prompt,
     assign_tool_prompt,
     generate_final_response
 )
-from tools.toolbox import invoke_tools, ToolInvocation, tool_registry
+from tools.toolbox import tool_registry
 # Import all tools to ensure they're registered
 from schemas.resp_formats import TaskList, ToolAssignment, FinalResponse
-from configurations.llm_client import LLMClient
+from configurations.llm_client import get_llm_client
+from agents._semcache import response_cache
 from pydantic import BaseModel
 from typing import Any
 
 
-llm_client = LLMClient()
+llm_client = get_llm_client()
+
+# (registry version, formatted string) — the tool set is effectively
+# static at runtime, so the catalog is formatted once per version
+_tools_str_cache = None
 
 def get_available_tools():
     """Get list of available tools and their metadata."""
-    tools = tool_registry.get_tools()
-    
+    global _tools_str_cache
+
+    if _tools_str_cache and _tools_str_cache[0] == tool_registry.version:
+        return _tools_str_cache[1]
+
+    metadata = tool_registry.list_tools()
+
     # Get metadata but format it in a more LLM-friendly way
-    metadata = tool_registry.get_metadata()
     formatted_metadata = []
-    
+
     for name, info in metadata.items():
         tool_desc = f"""Tool: {name}
 Description: {info['description']}
 Parameters: {', '.join(info['parameters'].keys())}
 """
         formatted_metadata.append(tool_desc)
-    
+
     formatted_tools = "\n\n".join(formatted_metadata)
-    
+    _tools_str_cache = (tool_registry.version, formatted_tools)
+
     return formatted_tools
 
-def call_llm_with_retry(role: str, content: str, response_model: type[BaseModel], max_retries: int = 3) -> Any:
-    """Call LLM with retry logic, using instructor for response parsing."""
-    for attempt in range(max_retries):
-        try:
-            response = llm_client.chat(role=role, content=content, response_model=response_model)
-            return response
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise e
-
-def determine_action_list(query: str) -> str:
+async def call_llm_with_retry(role: str, content: str, response_model: type[BaseModel]) -> Any:
+    """Call the LLM, awaiting the async client directly.
+
+    Retry with backoff lives inside LLMClient.chat, so this is a thin
+    async passthrough kept under the established name. Responses are
+    cached by prompt content, so a repeated decompose/assign prompt is
+    revalidated from the cache instead of costing another round trip.
+    """
+    cached = await response_cache.get(content, response_model.__name__)
+    if cached is not None:
+        return response_model.model_validate_json(cached)
+
+    response = await llm_client.chat(role=role, content=content, response_model=response_model)
+    if response is not None:
+        await response_cache.put(content, response_model.__name__, response)
+    return response
+
+async def determine_action_list(query: str) -> str:
     """
     Process the user query through the full pipeline:
     1. Decompose into tasks
-    2. Assign tools to tasks
+    2. Assign tools to tasks (fanned out concurrently)
     3. Execute tools
     4. Generate final response
     """
@@ -56,70 +78,107 @@ def determine_action_list(query: str) -> str:
         if not tools_metadata:
             return "I'm sorry, but I don't have any tools available to process your request."
 
-        # Step 1: Decompose query into tasks
-        task_prompt = decompose_tasks_prompt.replace("{{query}}", query)
-        tasks = call_llm_with_retry(
+        # Step 1: Decompose query into tasks (gates the fan-out, so serial)
+        # render() fills every slot in one pass over the template instead
+        # of one full scan (and intermediate string) per placeholder
+        task_prompt = render(
+            decompose_tasks_prompt,
+            query=query,
+            tools_info=tools_metadata
+        )
+        tasks = await call_llm_with_retry(
             role="user",
             content=task_prompt,
             response_model=TaskList
         )
 
-        # Step 2: Assign and execute tools for each task
-        results = []
-        
-        for task in tasks.tasks:
-            # Get tool assignment for task
-            tool_prompt = assign_tool_prompt.replace(
-                "{{task_name}}", task.name
-            ).replace(
-                "{{task_description}}", task.description
-            ).replace(
-                "{{tools}}", str(tools_metadata)
+        # Step 2: Assign and execute tools wave by wave along the task
+        # DAG: tasks whose dependencies are complete run concurrently,
+        # dependents wait only on their own prerequisites
+        task_items = {task.name: task for task in tasks.tasks}
+        results_by_name = {}
+
+        async def assign_and_execute(task):
+            task_input = f"{task.name}: {task.description}"
+
+            # Surface predecessor outputs so dependent tasks can use them
+            context = "\n".join(
+                f"{dep}: {results_by_name[dep]}"
+                for dep in task.depends_on
+                if dep in results_by_name
+            )
+            if context:
+                task_input += f"\nResults from prerequisite tasks:\n{context}"
+
+            tool_prompt = render(
+                assign_tool_prompt,
+                tools_info=tools_metadata,
+                task_input=task_input
             )
-            
-            tool_assignment = call_llm_with_retry(
+
+            tool_assignment = await call_llm_with_retry(
                 role="user",
                 content=tool_prompt,
                 response_model=ToolAssignment
             )
-            
-            # Validate tool assignment before creating ToolInvocation
+
+            # Validate tool assignment before executing
             if not tool_assignment or not tool_assignment.tool_name:
-                continue
-                
-            # Convert to ToolInvocation with validation
-            try:
-                tool_invocation = ToolInvocation(
-                    tool=tool_assignment.tool_name,
-                    tool_input=tool_assignment.parameters
+                return None
+
+            tool_result = await tool_registry.execute_tool(
+                tool_assignment.tool_name,
+                tool_assignment.parameters
+            )
+
+            return {
+                "task": task.name,
+                "result": tool_result
+            }
+
+        results = []
+        pending = dict(task_items)
+        completed = set()
+        while pending:
+            ready = [
+                task for task in pending.values()
+                if all(
+                    dep in completed or dep not in task_items
+                    for dep in task.depends_on
                 )
-                
-                # Execute tool
-                tool_result = invoke_tools([tool_invocation])
-                
-                results.append({
-                    "task": task.name,
-                    "result": tool_result[0] if tool_result else None
-                })
-            except ValueError as ve:
-                continue
-            except Exception as e:
-                continue
+            ]
+            if not ready:
+                # Dependency cycle; fall back to the listed order
+                ready = list(pending.values())
+
+            outcomes = await asyncio.gather(
+                *(assign_and_execute(task) for task in ready),
+                return_exceptions=True
+            )
+
+            for task, outcome in zip(ready, outcomes):
+                if outcome is not None and not isinstance(outcome, BaseException):
+                    results.append(outcome)
+                    results_by_name[task.name] = outcome["result"]
+                pending.pop(task.name)
+                completed.add(task.name)
 
         # Step 3: Generate final response
-        final_prompt = generate_final_response.replace(
-            "{{query}}", query
-        ).replace(
-            "{{results}}", str(results)
+        # JSON rather than repr: one C-level encode instead of a nested
+        # Python repr walk, and the LLM gets a cleaner grammar to parse
+        final_prompt = render(
+            generate_final_response,
+            query=query,
+            results=orjson.dumps(results, default=str).decode()
         )
-        
-        final_response = call_llm_with_retry(
+
+        final_response = await call_llm_with_retry(
             role="user",
             content=final_prompt,
             response_model=FinalResponse
         )
-        
+
         return final_response.content if final_response else "I was unable to process your request properly."
-        
+
     except Exception as e:
-        return f"I encountered an error while processing your request: {str(e)}"
\ No newline at end of file
+        return f"I encountered an error while processing your request: {str(e)}"
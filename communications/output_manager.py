@@ -1,19 +1,41 @@
 # utilities/output_manager.py
 from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
+import time
+import orjson
 from utilities.errors import AppError
 
 
-class OutputResult(BaseModel):
-    """Model for individual task/action results"""
+def _serialize_value(value: Any) -> str:
+    """Render a result payload as text.
+
+    Dict/list payloads go through orjson (Rust-backed, handles datetime
+    natively) instead of str(), which both reads better and avoids the
+    pure-Python repr walk on large nested results.
+    """
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(
+            value, default=str, option=orjson.OPT_INDENT_2
+        ).decode()
+    return str(value)
+
+
+# Plain dataclass rather than a pydantic model: results are internal
+# bookkeeping appended once per task, so full validation on every
+# allocation bought nothing. Validation still happens at the
+# OutputSummary boundary where results are serialized out.
+@dataclass(slots=True)
+class OutputResult:
+    """Individual task/action result"""
     task_id: str
     agent_name: Optional[str]
-    timestamp: datetime = Field(default_factory=datetime.now)
     status: str
     result: Any
     error: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
 
 class OutputSummary(BaseModel):
     """Model for aggregated results"""
@@ -30,7 +52,15 @@ class OutputManagerModel(BaseModel):
     """Pydantic model for OutputManager state"""
     results: List[OutputResult] = Field(default_factory=list)
     start_time: Optional[datetime] = None
+    # perf_counter reference for execution_time: monotonic, so elapsed
+    # time stays correct across wall-clock adjustments; start_time is
+    # kept for user-visible timestamps only
+    start_perf: Optional[float] = None
     request_id: Optional[str] = None
+    # Running tallies kept in add_result so get_summary doesn't rescan
+    # the full results list per call
+    success_count: int = 0
+    failed_count: int = 0
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -43,7 +73,10 @@ class OutputManager:
         """Start tracking a new request"""
         self.state.results = []
         self.state.start_time = datetime.now()
+        self.state.start_perf = time.perf_counter()
         self.state.request_id = request_id
+        self.state.success_count = 0
+        self.state.failed_count = 0
 
     def add_result(self, 
                   task_id: str,
@@ -63,6 +96,10 @@ class OutputManager:
                 metadata=metadata or {}
             )
             self.state.results.append(output_result)
+            if status == "success":
+                self.state.success_count += 1
+            elif status == "error":
+                self.state.failed_count += 1
         except Exception as e:
             raise AppError(f"Error adding result: {str(e)}")
 
@@ -71,9 +108,9 @@ class OutputManager:
         if not self.state.start_time or not self.state.request_id:
             raise AppError("No active request found")
 
-        execution_time = (datetime.now() - self.state.start_time).total_seconds()
-        successful = sum(1 for r in self.state.results if r.status == "success")
-        failed = sum(1 for r in self.state.results if r.status == "error")
+        execution_time = time.perf_counter() - self.state.start_perf
+        successful = self.state.success_count
+        failed = self.state.failed_count
 
         return OutputSummary(
             request_id=self.state.request_id,
@@ -93,7 +130,7 @@ class OutputManager:
         formatted.append("=== Results ===")
         
         if 'result' in response:
-            formatted.append(str(response['result']))
+            formatted.append(_serialize_value(response['result']))
             
         if 'error' in response:
             formatted.append(f"Error: {response['error']}")
@@ -1,26 +1,22 @@
 # configurations/llm_client.py
 from openai import AsyncOpenAI
+import httpx
 import instructor
-from typing import Any, Type, Dict
+from typing import Any, Type, Dict, Optional
+from functools import lru_cache
 import asyncio
+import random
 from pydantic import BaseModel
 from utilities.errors import LLMConnectionError, LLMValidationError, LLMError
 from config.settings import get_settings
 
 
 class LLMClient:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(LLMClient, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    # Fixed attribute set: slot storage skips the per-instance dict and
+    # makes every self.<attr> read in the hot chat path an offset load
+    __slots__ = ("api_key", "base_url", "model", "max_retries", "timeout", "client", "http_client")
 
     def __init__(self):
-        if self._initialized:
-            return
-            
         settings = get_settings()
         self.api_key = settings.llm_api_key
         self.base_url = settings.llm_base_url
@@ -28,14 +24,37 @@ class LLMClient:
         self.max_retries = settings.max_retries
         self.timeout = settings.timeout
         self._create_client()
-        self._initialized = True
 
     def _create_client(self):
         """Create AsyncOpenAI client for Ollama."""
         try:
+            # A pipeline handles 3+ LLM round-trips per user query; a
+            # shared pool with keep-alive skips the TCP+TLS handshake on
+            # every call after the first. HTTP/2 additionally multiplexes
+            # the concurrent task fan-out over one connection, but needs
+            # the optional h2 package.
+            try:
+                self.http_client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32,
+                        max_connections=64
+                    ),
+                    timeout=self.timeout
+                )
+            except ImportError:  # httpx[http2] extra not installed
+                self.http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32,
+                        max_connections=64
+                    ),
+                    timeout=self.timeout
+                )
+
             self.client = instructor.from_openai(AsyncOpenAI(
                 base_url=self.base_url,
                 api_key=self.api_key,
+                http_client=self.http_client,
             ),
             mode=instructor.Mode.JSON
             )
@@ -46,25 +65,69 @@ class LLMClient:
                 details={"error": str(e)}
             )
 
-    async def _process_llm_response(self, response: Dict[str, Any], response_model: Type[BaseModel]) -> Any:
-        """Process raw LLM response into structured output."""
+    async def aclose(self):
+        """Close the pooled HTTP connections on shutdown."""
+        await self.http_client.aclose()
+
+    async def chat_stream(self, role: str, content: str, system: Optional[str] = None):
+        """Stream a chat completion, yielding text chunks as they arrive.
+
+        No response model is applied — the raw token stream is yielded so
+        callers can surface output at first-token latency. Callers that
+        need structured output should fall back to `chat` on failure.
+        """
+        messages = []
+        if system:
+            messages.append({
+                "role": "system",
+                "content": system
+            })
+        messages.append({
+            "role": role,
+            "content": content
+        })
+
         try:
-            # Assuming response.choices[0].message.content contains JSON
-            content = response.model_dump_json()
-            return response_model.model_validate_json(content)
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                response_model=None,
+                stream=True
+            )
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
         except Exception as e:
-            raise LLMValidationError(
-                "Failed to parse LLM response",
-                [str(e)],
-                details={"response": content}
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(
+                "Failed to stream response from LLM",
+                details={
+                    "error": str(e),
+                    "model": self.model
+                }
             )
 
-    async def chat(self, role: str, content: str, response_model: Type[BaseModel]) -> Any:
-        """Send a chat completion request to Ollama with structured output handling."""
+    async def chat(self, role: str, content: str, response_model: Type[BaseModel], system: Optional[str] = None) -> Any:
+        """Send a chat completion request to Ollama with structured output handling.
+
+        When `system` is provided it is sent as a separate leading system
+        message. Keeping the static instructions byte-identical across calls
+        lets the provider's automatic prefix caching reuse them, so only the
+        short user message is new input on repeat requests.
+        """
+        # Hoist the per-call attribute reads out of the retry loop
+        client = self.client
+        model = self.model
+        max_retries = self.max_retries
+
         attempt = 0
-        last_error = None
 
-        while attempt < self.max_retries:
+        while attempt < max_retries:
             try:
                 # Validate inputs
                 if not content.strip():
@@ -73,34 +136,60 @@ class LLMClient:
                         ["content cannot be empty"]
                     )
 
+                messages = []
+                if system:
+                    messages.append({
+                        "role": "system",
+                        "content": system
+                    })
+                messages.append({
+                    "role": role,
+                    "content": content
+                })
+
                 # Create completion
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{
-                        "role": role,
-                        "content": content
-                    }],
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
                     temperature=0.7,
                     response_model=response_model
                 )
-                
-                # Process response into structured output
-                return await self._process_llm_response(response, response_model)
+
+                # Instructor already returns the parsed response_model
+                # instance; re-serializing and re-validating it was pure
+                # overhead per call
+                return response
 
             except Exception as e:
+                # Bad input can't succeed on retry; don't burn backoff
+                # time sleeping on it
+                if isinstance(e, LLMValidationError):
+                    raise
+
                 attempt += 1
-                
-                if attempt >= self.max_retries:
+
+                if attempt >= max_retries:
                     if isinstance(e, LLMError):
                         raise
                     raise LLMError(
                         "Failed to get valid response from LLM",
                         details={
                             "error": str(e),
-                            "model": self.model,
+                            "model": model,
                             "attempts": attempt
                         }
                     )
-                
-                # Exponential backoff
-                await asyncio.sleep(2 ** attempt)
\ No newline at end of file
+
+                # Jittered exponential backoff, capped at 10s, so
+                # concurrent failures don't all retry in lockstep
+                await asyncio.sleep(min(10.0, random.uniform(1.0, 3.0 ** attempt)))
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    """Return the shared LLMClient, creating it on first use.
+
+    lru_cache makes construction one-shot and thread-safe, replacing the
+    old __new__/_initialized singleton dance that re-entered __init__ on
+    every LLMClient() call.
+    """
+    return LLMClient()
@@ -1,13 +1,32 @@
+import re
 
-decompose_tasks_prompt = """Analyze this user request and break it down into step-by-step tasks.
-For each task, determine which tools would be most appropriate.
+# Prompts are split into a static "system" half (instructions, tool catalog,
+# examples) and a short "user" half holding only the per-request values. The
+# static half is sent first and byte-identical across calls so provider-side
+# prefix caching can reuse it; the combined single-string versions are kept
+# below for callers that still send one prompt.
+
+_SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def render(template: str, **values: str) -> str:
+    """Fill a template's {{slot}} markers in a single pass.
 
-User Request: {{query}}
+    Unknown slots are left untouched. This replaces chains of
+    str.replace calls that each re-scanned the whole template.
+    """
+    return _SLOT_RE.sub(
+        lambda match: str(values.get(match.group(1), match.group(0))),
+        template
+    )
+
+decompose_tasks_system = """Analyze the user request and break it down into step-by-step tasks.
+For each task, determine which tools would be most appropriate.
 
 The available tools are:
 {{tools_info}}
 
-Break this into sequential tasks, where each task builds on the previous ones.
+Break this into tasks, naming any earlier tasks a task depends on.
 Return a list of tasks in this exact format:
 {
     "tasks": [
@@ -17,23 +36,30 @@ Return a list of tasks in this exact format:
             "tool": "name_of_tool_to_use",
             "parameters": {
                 "param1": "value1"
-            }
+            },
+            "depends_on": ["names_of_prerequisite_tasks"]
+        }
            ]
 }
 
+List prerequisite task names in depends_on; leave it empty for tasks
+that can run immediately. Tasks with no dependency between them may run
+in parallel.
+
 For the example query "Research meteorology then write weather code":
 1. First task should use ddg_search to gather meteorology information
 2. Second task should use execute_python_code to write code based on the research
 
 Each task should have all necessary information to execute."""
 
-assign_tool_prompt = '''You are a JSON response generator. Given user input, choose the best tool to handle the request and return a properly formatted JSON response.
+decompose_tasks_user = """User Request: {{query}}"""
 
-Available tools:
-{{tools_info}}
+decompose_tasks_prompt = decompose_tasks_system + "\n\n" + decompose_tasks_user
 
-User request: {{task_input}}
+assign_tool_system = '''You are a JSON response generator. Given user input, choose the best tool to handle the request and return a properly formatted JSON response.
 
+Available tools:
+{{tools_info}}
 
 Response must be VALID JSON in exactly this format:
 {
@@ -43,9 +69,12 @@ Response must be VALID JSON in exactly this format:
     }
 }
 
-
 Respond with ONLY the JSON. No other text.'''
 
+assign_tool_user = '''User request: {{task_input}}'''
+
+assign_tool_prompt = assign_tool_system + "\n\n" + assign_tool_user
+
 generate_final_response = """Based on the search results and any other tool outputs, create a natural language response.
 
 Original Query: {{query}}
@@ -60,7 +89,7 @@ If the results indicate no data was found or errors occurred, acknowledge this a
 
 get_agent_capabilities = """
 Given this user request, break it down into specific tasks that can be handled by our agents.
-            
+
             User Request: {{request}}
 
             Available Capabilities:
@@ -91,33 +120,27 @@ Given this user request, break it down into specific tasks that can be handled b
 """
 
 
-summarize_final_response = """
+summarize_final_system = """Based on tool results and the user's original request, provide a clear summary.
 
-Based on these tool results and the user's original request, provide a clear summary:
-            User's Request: 
-            {{user_input}}
+Create a full response that:
+1. Summarizes the key information that answers the user's question
+2. Notes any limitations or issues
+3. Suggests follow-up actions if appropriate
+4. If code is provided, ensure it is formatted correctly
+5. Provide references or citations if needed, including any relevant URLs that were part of the results"""
 
-            Tool Results:
-            {{formatted_results}}
+summarize_final_user = """User's Request:
+{{user_input}}
 
+Tool Results:
+{{tool_results}}"""
 
-            Create a full response that:
-            1. Summarizes the key information that answers the user's question
-            2. Notes any limitations or issues
-            3. Suggests follow-up actions if appropriate
-            4. If code is provided, ensure it is formatted correctly
-            5. Provide references or citations if needed, including any relevant URLs that were part of the results
-
-"""
-
-generate_code = """Based on these research results about meteorology and weather forecasting,
-                    write Python code that meets this goal:
-                    {{task_description}}
+summarize_final_response = summarize_final_system + "\n\n" + summarize_final_user
 
-                    Context from previous research:
-                    {{previous_results}}
+generate_code_system = """You write Python code that meets a stated goal, using any provided
+                    research context.
 
-                    Write concise, well-documented Python code that solves this task.
+                    Write concise, well-documented Python code that solves the task.
                     The code must be complete and executable.
                     Do not include string literals of code or code generation functions
                     Only return the actual Python code, no additional text or explanation.
@@ -134,14 +157,18 @@ generate_code = """Based on these research results about meteorology and weather
 
             """
 
-handle_code_error = """
+generate_code_user = """Task:
+{{task_description}}
+
+Context from previous research:
+{{previous_results}}"""
+
+generate_code = generate_code_system + "\n\n" + generate_code_user
+
+handle_code_error_system = """
             Code was generated for a task based on a user's request, but an error occurred when executing the code.
             Your job is to review the code and the error and return corrected code.
 
-            Task: {{task_description}}
-            Error: {{error_message}}
-            Code: {{code}}
-
             Review the code and error message, then correct the code as needed.
 
             Return the corrected code in this format:
@@ -150,4 +177,9 @@ handle_code_error = """
             }
 
 """
-            
\ No newline at end of file
+
+handle_code_error_user = """Task: {{task_description}}
+Error: {{error_message}}
+Code: {{code}}"""
+
+handle_code_error = handle_code_error_system + "\n\n" + handle_code_error_user
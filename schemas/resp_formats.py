@@ -14,6 +14,7 @@ class TaskItem(BaseModel):
     description: str = Field(..., description="Description of what needs to be done")
     tool: str = Field(..., description="Name of the tool to use")
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list, description="Names of tasks that must complete first")
     class Config:
         mode = Mode.JSON
 
@@ -48,4 +48,6 @@ def ddg_search(topic: str, max_results: int = 10) -> str:
         return f"Error performing search: {str(e)}"
     
 
-print(ddg_search("Python"))
\ No newline at end of file
+if __name__ == "__main__":
+    # Manual smoke test only; never hit the network at import time
+    print(ddg_search("Python"))
\ No newline at end of file
@@ -1,10 +1,101 @@
 import ast
+import asyncio
+import contextlib
 import io
-import sys
 import importlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Optional
 from .toolbox import tool, tool_registry
 
+# Worker pool for exec: generated code runs outside the event-loop
+# process, so concurrent tool calls don't contend on the GIL and a
+# hung snippet can't wedge the agent. Created lazily on first use.
+_pool = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=2)
+    return _pool
+
+
+@lru_cache(maxsize=256)
+def _compile_source(code: str):
+    """Compile source in the worker; optimize=2 strips asserts and
+    docstrings. Cached per worker process so repeat submissions skip
+    the compile pass."""
+    return compile(code, "<tool>", "exec", optimize=2)
+
+
+def _run_code(code: str, module_names: tuple) -> str:
+    """Execute validated code in a worker process and capture stdout.
+
+    Runs in the pool worker: imports are re-resolved and the source
+    compiled here because module objects and code objects don't cross
+    the process boundary. redirect_stdout scopes the capture to this
+    exec instead of swapping sys.stdout process-wide.
+    """
+    globals_dict = {'__builtins__': __builtins__}
+    for module_name in module_names:
+        try:
+            globals_dict[module_name] = importlib.import_module(module_name)
+        except ImportError as e:
+            raise ValueError(f"Could not import {module_name}: {str(e)}")
+
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(_compile_source(code), globals_dict, {})
+    return buf.getvalue()
+
+
+class _ImportCollector(ast.NodeVisitor):
+    """Classify imports in one traversal.
+
+    Only Import/ImportFrom get dedicated handlers; every other node
+    falls through to generic_visit. Imports nested in function and
+    class bodies are still visited — they execute when the function is
+    called, so they count for validation.
+    """
+
+    def __init__(self, allowed_modules: frozenset, blocked_modules: frozenset):
+        self.allowed_modules = allowed_modules
+        self.blocked_modules = blocked_modules
+        self.required = set()
+        self.blocked = set()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.name in self.blocked_modules:
+                self.blocked.add(alias.name)
+            elif alias.name in self.allowed_modules:
+                self.required.add(alias.name)
+
+    def visit_ImportFrom(self, node):
+        if node.module in self.blocked_modules:
+            self.blocked.add(node.module)
+        elif node.module in self.allowed_modules:
+            self.required.add(node.module)
+
+
+@lru_cache(maxsize=256)
+def _analyze_imports(code: str, allowed_modules: frozenset, blocked_modules: frozenset) -> tuple:
+    """Parse `code` once and classify its imports.
+
+    Returns (required_imports, blocked_imports). Cached on the exact
+    source text: agent retry loops frequently re-submit the same code,
+    and re-parsing dominated the cost of repeat calls. Compilation
+    happens in the worker process, which has its own source cache —
+    code objects don't cross the process boundary.
+    """
+    tree = ast.parse(code)
+    collector = _ImportCollector(allowed_modules, blocked_modules)
+    collector.visit(tree)
+
+    return frozenset(collector.required), frozenset(collector.blocked)
+
+
 @tool('code')
 async def execute_python_code(code: str, timeout: Optional[int] = 30) -> str:
     """Execute Python code and return result."""
@@ -14,47 +105,42 @@ async def execute_python_code(code: str, timeout: Optional[int] = 30) -> str:
         if not tool_config:
             raise ValueError("Tool configuration not found")
 
-        allowed_modules = set(tool_config.get('allowed_modules', []))
-        blocked_modules = set(tool_config.get('blocked_modules', []))
-
-        # Parse and validate imports
-        tree = ast.parse(code)
-        required_imports = set()
-        
-        # Analyze code for imports
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name in blocked_modules:
-                        raise ValueError(f"Importing {alias.name} is not allowed")
-                    if alias.name in allowed_modules:
-                        required_imports.add(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module in blocked_modules:
-                    raise ValueError(f"Importing from {node.module} is not allowed")
-                if node.module in allowed_modules:
-                    required_imports.add(node.module)
-
-        # Create execution environment with allowed imports
-        globals_dict = {'__builtins__': __builtins__}
-        for module_name in required_imports:
-            try:
-                module = importlib.import_module(module_name)
-                globals_dict[module_name] = module
-            except ImportError as e:
-                raise ValueError(f"Could not import {module_name}: {str(e)}")
-
-        # Execute with validated imports
-        stdout = io.StringIO()
-        sys.stdout = stdout
-        
-        try:
-            exec(code, globals_dict, {})
-            output = stdout.getvalue()
-        finally:
-            sys.stdout = sys.__stdout__
-        
+        # Frozensets precomputed once by the registry, not rebuilt per call
+        allowed_modules = tool_config.get('_allowed_modules_fs', frozenset())
+        blocked_modules = tool_config.get('_blocked_modules_fs', frozenset())
+
+        # C-level substring scan before any parsing: both import forms
+        # contain the word "import", so its absence proves there is
+        # nothing for the AST analysis to find
+        if 'import' in code:
+            required_imports, blocked_imports = _analyze_imports(
+                code, allowed_modules, blocked_modules
+            )
+            if blocked_imports:
+                raise ValueError(
+                    f"Importing {', '.join(sorted(blocked_imports))} is not allowed"
+                )
+        else:
+            required_imports = frozenset()
+
+        # Belt and braces: LLM-built parameter dicts can carry numbers
+        # as strings, and wait_for needs a real number
+        timeout = int(timeout) if timeout is not None else None
+
+        # Execute in the worker pool. Syntax errors surface from the
+        # worker's compile (or from ast.parse above when the code has
+        # imports) and come back as the usual error string.
+        loop = asyncio.get_running_loop()
+        output = await asyncio.wait_for(
+            loop.run_in_executor(
+                _get_pool(), _run_code, code, tuple(sorted(required_imports))
+            ),
+            timeout=timeout
+        )
+
         return output if output else "Code executed successfully (no output)"
-        
+
+    except asyncio.TimeoutError:
+        return f"Error executing code: timed out after {timeout} seconds"
     except Exception as e:
         return f"Error executing code: {str(e)}"
\ No newline at end of file
@@ -1,28 +1,37 @@
 # tools/models.py
-from typing import Dict, Any, Optional, Set
-from pydantic import BaseModel, Field
+import sys
+from typing import Dict, Any, Set
+from dataclasses import dataclass, field
 
-class ToolState(BaseModel):
-    """State container for tool registry"""
-    tools: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
-    function_types: Dict[str, Set[str]] = Field(default_factory=dict)
-    initialized_tools: Set[str] = Field(default_factory=set)
-    allowed_modules: Set[str] = Field(default_factory=set)  
 
+# Slotted dataclass instead of a pydantic model: the registry touches
+# this container on every config lookup and tool execution, and it only
+# ever holds trusted internal state, so validation on each mutation was
+# overhead without benefit.
+@dataclass(slots=True)
+class ToolState:
+    """State container for tool registry"""
+    tools: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    function_types: Dict[str, Set[str]] = field(default_factory=dict)
+    initialized_tools: Set[str] = field(default_factory=set)
+    allowed_modules: Set[str] = field(default_factory=set)
+    version: int = 0
 
     def register_tool(self, name: str, config: Dict[str, Any]) -> None:
         """Register a tool with its configuration"""
+        # Interned so lookups against these keys compare by identity
+        name = sys.intern(name)
         self.tools[name] = config
-        
-        # Register function type
+        self.version += 1
+
+        # Register function type: setdefault fuses the membership test
+        # and insert into one lookup
         function_type = config.get("function_type")
         if function_type:
-            if function_type not in self.function_types:
-                self.function_types[function_type] = set()
-            self.function_types[function_type].add(name)
-        
+            self.function_types.setdefault(function_type, set()).add(name)
+
         self.initialized_tools.add(name)
 
-    def get_tools_by_type(self, function_type: str) -> Set[str]:
-        """Get all tool names of a specific type"""
-        return self.function_types.get(function_type, set())
\ No newline at end of file
+    def get_tools_by_type(self, function_type: str) -> frozenset:
+        """Get all tool names of a specific type (read-only)"""
+        return frozenset(self.function_types.get(function_type, ()))
@@ -1,38 +1,73 @@
 # tools/search_functions.py
+import time
+from collections import OrderedDict
+from operator import itemgetter
+
 from duckduckgo_search import DDGS
 from .toolbox import tool
 
+# One shared DDGS instance keeps its underlying HTTP connection pool
+# warm instead of re-establishing a session per search. Created lazily
+# so importing the module stays free of network setup.
+_ddgs = None
+
+# Identical queries within the TTL return the cached text instead of
+# hitting the network again
+_SEARCH_CACHE_MAX = 256
+_SEARCH_CACHE_TTL = 300.0  # seconds
+_search_cache: OrderedDict = OrderedDict()
+
+# One C-level tuple extraction per result instead of three dict lookups
+_get_title_href_body = itemgetter('title', 'href', 'body')
+
+
+def _get_ddgs() -> DDGS:
+    global _ddgs
+    if _ddgs is None:
+        _ddgs = DDGS()
+    return _ddgs
+
 
 @tool('search')
 async def ddg_search(topic: str, max_results: int = 5) -> str:
     """
     Search DuckDuckGo and return results. Returns only basic information and urls.
     If more data is needed, use web search instead or use it after this function with one of the urls.
-    
+
     Args:
         topic: Search query string
         max_results: Maximum number of results to return
-        
+
     Returns:
         String containing formatted search results
     """
-    
+
     try:
-        ddgs = DDGS()
-        results = list(ddgs.text(str(topic), max_results=int(max_results)))
-        formatted_results = []
-        
+        cache_key = (str(topic), int(max_results))
+        entry = _search_cache.get(cache_key)
+        if entry is not None:
+            expires, cached = entry
+            if time.monotonic() < expires:
+                _search_cache.move_to_end(cache_key)
+                return cached
+            del _search_cache[cache_key]
+
+        results = list(_get_ddgs().text(str(topic), max_results=int(max_results)))
+
         if not results:
             return f"No results found for: {topic}"
-        
-        for result in results:
-            formatted_results.append(
-                f"Title: {result['title']}\n"
-                f"URL: {result['href']}\n"
-                f"Summary: {result['body']}\n"
-                "---"
-            )
-        
-        return "\n\n".join(formatted_results)
+
+        # Single generator straight into join — no intermediate list of
+        # formatted strings
+        formatted = "\n\n".join(
+            f"Title: {title}\nURL: {href}\nSummary: {body}\n---"
+            for title, href, body in map(_get_title_href_body, results)
+        )
+
+        _search_cache[cache_key] = (time.monotonic() + _SEARCH_CACHE_TTL, formatted)
+        while len(_search_cache) > _SEARCH_CACHE_MAX:
+            _search_cache.popitem(last=False)
+
+        return formatted
     except Exception as e:
-        return f"Error performing search: {str(e)}"
\ No newline at end of file
+        return f"Error performing search: {str(e)}"
@@ -1,15 +1,20 @@
 # tools/toolbox.py
-from typing import Any, Dict, Callable, Optional
-from functools import wraps
+from typing import Any, Dict, Callable, Optional, Union, get_args, get_origin
+from types import MappingProxyType
+import logging
+import re
 import yaml
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field
 import asyncio
+import sys
 import threading
 import inspect
 from pathlib import Path
 from tools.models import ToolState
 from utilities.errors import ToolError, ToolConfigError, ToolNotFoundError, ToolValidationError, ToolExecutionError
 
+logger = logging.getLogger(__name__)
+
 
 class ToolConfig(BaseModel):
     """Tool configuration and metadata"""
@@ -21,20 +26,49 @@ class ToolConfig(BaseModel):
     requires: Optional[list[str]] = Field(default_factory=list)
     validation: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
+# Annotation -> declared parameter type; one dict hit instead of a
+# comparison chain per parameter
+_ANNO_MAP = {int: "integer", float: "float", bool: "boolean", str: "string"}
+
+# Declared parameter type -> coercion callable; covers both the short
+# and long spellings used across tools.yaml and inferred configs
+_CASTERS = {
+    "int": int,
+    "integer": int,
+    "float": float,
+    "bool": bool,
+    "boolean": bool,
+    "str": str,
+    "string": str,
+}
+
+# Inferred parameter dicts keyed by the function's code object, so
+# re-registering the same function (tests, hot reload) skips the
+# expensive inspect.signature pass
+_sig_cache: Dict[Any, Dict[str, Any]] = {}
+
+
 class ToolRegistry:
     """Registry for tool functions with enhanced error handling"""
     _instance = None
     _lock = threading.Lock()
 
     def __new__(cls, config_path: Optional[str] = None):
+        # Double-checked: once the singleton exists, return it without
+        # touching the lock; only the first-creation path pays the mutex
+        if cls._instance is not None:
+            return cls._instance
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super(ToolRegistry, cls).__new__(cls)
+                instance = super(ToolRegistry, cls).__new__(cls)
                 # Initialize instance attributes here
-                cls._instance.config_path = config_path or Path(__file__).parent / "config" / "tools.yaml"
-                cls._instance.state = ToolState()
-                cls._instance.functions = {}
-                cls._instance._initialized = False
+                instance.config_path = config_path or Path(__file__).parent / "config" / "tools.yaml"
+                instance.state = ToolState()
+                instance.functions = {}
+                instance._initialized = False
+                instance._tools_loaded = False
+                # Publish only after the instance is fully set up
+                cls._instance = instance
             return cls._instance
 
     def __init__(self, config_path: Optional[str] = None):
@@ -47,72 +81,95 @@ class ToolRegistry:
                         self.config_path = Path(config_path)
 
     def register_function(self, func: Callable, function_type: str) -> Callable:
-        """Register a function as a tool with parameter inference"""
-        with self._lock:
-            try:
-                name = func.__name__
-                self.functions[name] = func
-                
-                # Get function signature for parameter info
+        """Register a function as a tool with parameter inference.
+
+        No lock here: registration happens at import time via the @tool
+        decorator, where the import machinery already serializes us.
+        """
+        try:
+            # Interned keys let dict lookups short-circuit on identity
+            name = sys.intern(func.__name__)
+            self.functions[name] = func
+
+            # Get function signature for parameter info, memoized on the
+            # code object since inspect.signature is expensive
+            parameters = _sig_cache.get(func.__code__)
+            if parameters is None:
                 sig = inspect.signature(func)
                 parameters = {}
-                
+
                 for param_name, param in sig.parameters.items():
                     if param_name == 'self':  # Skip self for methods
                         continue
-                        
+
                     param_info = {
                         "type": "string",  # Default to string
                         "description": "",
                         "required": param.default == inspect.Parameter.empty
                     }
-                    
-                    # Try to infer type from annotation
+
+                    # Try to infer type from annotation, unwrapping
+                    # Optional[X]/Union[X, None] to X first — otherwise
+                    # Optional[int] falls back to "string" and the
+                    # validator casts numeric defaults to str
                     if param.annotation != inspect.Parameter.empty:
-                        if param.annotation == int:
-                            param_info["type"] = "integer"
-                        elif param.annotation == float:
-                            param_info["type"] = "float"
-                        elif param.annotation == bool:
-                            param_info["type"] = "boolean"
-                        elif param.annotation == str:
-                            param_info["type"] = "string"
-                    
+                        annotation = param.annotation
+                        if get_origin(annotation) is Union:
+                            args = [
+                                a for a in get_args(annotation)
+                                if a is not type(None)
+                            ]
+                            if len(args) == 1:
+                                annotation = args[0]
+                        param_info["type"] = _ANNO_MAP.get(
+                            annotation, param_info["type"]
+                        )
+
                     # Add default if present
                     if param.default != inspect.Parameter.empty and param.default is not None:
                         param_info["default"] = param.default
-                    
+
                     parameters[param_name] = param_info
 
-                # Create tool config
-                config = {
-                    "function": f"{func.__module__}.{name}",
-                    "function_type": function_type,
-                    "description": func.__doc__ or "",
-                    "parameters": parameters,
-                    "returns": "string"
-                }
-                
-                # Register in state
-                self.state.register_tool(name, config)
-                return func
-                
-            except Exception as e:
-                raise ToolConfigError(
-                    func.__name__,
-                    ["Failed to register function"],
-                    {"error": str(e)}
-                )
+                _sig_cache[func.__code__] = parameters
+
+            # Create tool config
+            config = {
+                "function": f"{func.__module__}.{name}",
+                "function_type": function_type,
+                "description": func.__doc__ or "",
+                "parameters": parameters,
+                "returns": "string"
+            }
+
+            # Register in state
+            self.state.register_tool(name, config)
+            return func
+
+        except Exception as e:
+            raise ToolConfigError(
+                func.__name__,
+                ["Failed to register function"],
+                {"error": str(e)}
+            )
 
     def load_tools(self) -> None:
         """Load tool configurations with validation"""
         try:
+            # One-shot: lookups check this flag instead of re-testing
+            # dict truthiness (and re-attempting loads when the config
+            # yields no tools)
+            self._tools_loaded = True
+
             # Check if config file exists
             if not self.config_path.exists():
-                return 
+                return
 
             with open(self.config_path) as f:
-                config = yaml.safe_load(f)
+                # libyaml-backed loader when PyYAML was built with it;
+                # same safety guarantees as safe_load, parsed in C
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                config = yaml.load(f, Loader=loader)
 
             if not isinstance(config, dict) or "tools" not in config:
                 return
@@ -139,19 +196,45 @@ class ToolRegistry:
                 {"error": str(e)}
             )
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every tool registration.
+
+        Callers that cache data derived from the registry (rendered tool
+        catalogs, type maps) compare against this to know when to rebuild.
+        """
+        return self.state.version
+
     def get_tool_config(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get tool configuration"""
         # Lazy load tools if not already loaded
-        if not self.state.tools:
+        if not self._tools_loaded:
             self.load_tools()
-        return self.state.tools.get(tool_name)
+        config = self.state.tools.get(tool_name)
+        if config is not None and "_valid_params_fs" not in config:
+            # Cache the parameter-name frozenset so callers can clean
+            # incoming parameters with a set intersection
+            config["_valid_params_fs"] = frozenset(config.get("parameters", {}))
+            # Same treatment for the module allow/block lists (declared
+            # under "validation" in tools.yaml), so code execution can
+            # test membership without rebuilding sets per call
+            validation = config.get("validation") or {}
+            config["_allowed_modules_fs"] = frozenset(
+                validation.get("allowed_modules", config.get("allowed_modules", []))
+            )
+            config["_blocked_modules_fs"] = frozenset(
+                validation.get("blocked_modules", config.get("blocked_modules", []))
+            )
+        return config
 
     def list_tools(self) -> Dict[str, Dict[str, Any]]:
-        """Get all tool configurations"""
+        """Get all tool configurations as a read-only view"""
         # Lazy load tools if not already loaded
-        if not self.state.tools:
+        if not self._tools_loaded:
             self.load_tools()
-        return self.state.tools.copy()
+        # Zero-copy: callers only iterate/read, and the proxy prevents
+        # accidental mutation that the old per-call copy guarded against
+        return MappingProxyType(self.state.tools)
 
     def _validate_tool_config(self, tool_name: str, config: Dict[str, Any]) -> None:
         """Validate tool configuration"""
@@ -176,66 +259,52 @@ class ToolRegistry:
 
     async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Any:
         """Execute a tool with comprehensive error handling"""
+        # Names arrive from LLM output as fresh strings; interning maps
+        # them onto the registration-time keys so the dict lookups below
+        # hit the pointer-equality fast path
+        tool_name = sys.intern(tool_name)
         if tool_name not in self.state.tools:
             raise ToolNotFoundError(tool_name)
-            
+
         tool_config = self.state.tools[tool_name]
-        
-        try:
-            # Validate parameters
-            validated_params = self._validate_parameters(tool_name, parameters)
-            
-            try:
-                if "code" in validated_params:
-                    validated_params["code"] = validated_params["code"].strip()
-                else:
-                    validated_params = validated_params
-            except Exception as e:
-                raise ToolValidationError(
-                    tool_name,
-                    {"code": "Code parameter is required"},
-                    {"raw_parameters": parameters}
-                )
 
-            # Get the tool function
-            func = self.functions.get(tool_name)
-            if not func:
-                raise ToolNotFoundError(tool_name)
-
-            # Apply any tool-specific validation
-            validation_config = tool_config.get("validation", {})
-            self._apply_validation(tool_name, validation_config, validated_params)
-            
-            # Execute with timeout
-            timeout = parameters.get("timeout", 30)  # Default 30 seconds
-            try:
-                result = await asyncio.wait_for(
-                    func(**validated_params),
-                    timeout=timeout
-                )
-                print(f"Called {func.__name__} with parameters: {validated_params}")
-                return result
-                
-            except asyncio.TimeoutError:
-                raise ToolExecutionError(
-                    tool_name,
-                    "Tool execution timed out",
-                    {
-                        "timeout": timeout,
-                        "parameters": validated_params
-                    }
-                )
-                
-        except ValidationError as e:
-            raise ToolValidationError(
+        # Validation raises ToolValidationError directly; no wrapping
+        # try/except needed on the happy path
+        validated_params = self._validate_parameters(tool_name, parameters)
+
+        # str.strip can't fail on a validated string parameter
+        if "code" in validated_params:
+            validated_params["code"] = validated_params["code"].strip()
+
+        # Get the tool function
+        func = self.functions.get(tool_name)
+        if not func:
+            raise ToolNotFoundError(tool_name)
+
+        # Apply any tool-specific validation
+        self._apply_validation(tool_name, tool_config.get("validation", {}), validated_params)
+
+        # Execute with timeout: the only try frame on a successful call.
+        # Read from validated_params, where the declared type has been
+        # coerced — raw parameters may carry the number as a string
+        timeout = validated_params.get("timeout", 30)  # Default 30 seconds
+        try:
+            result = await asyncio.wait_for(
+                func(**validated_params),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            raise ToolExecutionError(
                 tool_name,
-                {err["loc"][0]: err["msg"] for err in e.errors()},
-                {"raw_parameters": parameters}
+                "Tool execution timed out",
+                {
+                    "timeout": timeout,
+                    "parameters": validated_params
+                }
             )
-            
+        except ToolError:
+            raise
         except Exception as e:
-            if isinstance(e, ToolError):
-                raise
             raise ToolExecutionError(
                 tool_name,
                 "Tool execution failed",
@@ -245,73 +314,103 @@ class ToolRegistry:
                 }
             )
 
+        # Lazy %s formatting: parameters can include multi-KB code
+        # strings, so don't render them unless debug logging is on
+        logger.debug("Called %s with parameters: %s", func.__name__, validated_params)
+        return result
+
     def _validate_parameters(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Validate tool parameters with detailed error reporting"""
-        tool_config = self.state.tools[tool_name]
-        param_specs = tool_config["parameters"]
+        # Local aliases: everything touched inside the loop is bound
+        # once here instead of re-resolved per parameter
+        param_specs = self.state.tools[tool_name]["parameters"]
+        get_value = parameters.get
+        casters = _CASTERS
         validated = {}
         invalid_params = {}
-        
+
         # Check for unknown parameters
-        unknown_params = set(parameters) - set(param_specs)
+        unknown_params = parameters.keys() - param_specs.keys()
         if unknown_params:
             raise ToolValidationError(
                 tool_name,
                 {param: "Unknown parameter" for param in unknown_params}
             )
-        
+
         # Validate each parameter
         for param_name, spec in param_specs.items():
-            value = parameters.get(param_name)
-            
+            value = get_value(param_name)
+
             # Check required parameters
-            if spec.get("required", False) and value is None:
-                invalid_params[param_name] = "Required parameter missing"
-                continue
-                
-            # Apply default if needed
-            if value is None and "default" in spec:
-                value = spec["default"]
-            
-            # Type validation
-            if value is not None:
-                try:
-                    param_type = spec["type"]
-                    if param_type == "int":
-                        value = int(value)
-                    elif param_type == "float":
-                        value = float(value)
-                    elif param_type == "bool":
-                        value = bool(value)
-                    elif param_type == "string":
-                        value = str(value)
-                    # Add more type validations as needed
-                except (ValueError, TypeError):
-                    invalid_params[param_name] = f"Invalid type. Expected {spec['type']}"
+            if value is None:
+                if spec.get("required", False):
+                    invalid_params[param_name] = "Required parameter missing"
                     continue
-                
+                # Apply default if needed
+                if "default" in spec:
+                    value = spec["default"]
+
+            # Type validation: dispatch through the caster table instead
+            # of a string-comparison chain
+            if value is not None:
+                caster = casters.get(spec["type"])
+                if caster is not None:
+                    try:
+                        value = caster(value)
+                    except (ValueError, TypeError):
+                        invalid_params[param_name] = f"Invalid type. Expected {spec['type']}"
+                        continue
+
             validated[param_name] = value
-        
+
         if invalid_params:
             raise ToolValidationError(tool_name, invalid_params)
-            
+
         return validated
 
+    @staticmethod
+    def _find_blocked_module(validation: Dict[str, Any], code: str) -> Optional[str]:
+        """Return the first blocked module referenced in `code`, if any.
+
+        One compiled alternation regex covers every blocked module in a
+        single scan; it is built on first use and cached on the tool's
+        validation dict. The word boundary and anchoring matter: a bare
+        substring matcher would reject "from osmosis import x" for
+        blocked "os" while missing "import  os" with extra whitespace.
+        """
+        # Anchored alternation: no per-module scans. The import branch
+        # skips over leading "name as alias," entries so a blocked
+        # module is caught anywhere in a comma list, not just first
+        blocked_re = validation.get("_blocked_re")
+        if blocked_re is None:
+            alternation = '|'.join(map(re.escape, validation["blocked_modules"]))
+            blocked_re = re.compile(
+                r'^\s*(?:from[ \t]+(' + alternation + r')\b'
+                r'|import[ \t]+(?:[\w.]+(?:[ \t]+as[ \t]+\w+)?[ \t]*,[ \t]*)*('
+                + alternation + r')\b)',
+                re.M
+            )
+            validation["_blocked_re"] = blocked_re
+
+        match = blocked_re.search(code)
+        if match:
+            return match.group(1) or match.group(2)
+        return None
+
     def _apply_validation(self, tool_name: str, validation: Dict[str, Any], parameters: Dict[str, Any]) -> None:
         """Apply tool-specific validation rules"""
         try:
-            if "code" in parameters and "blocked_modules" in validation:
-                code = parameters["code"]
-                for module in validation["blocked_modules"]:
-                    if f"import {module}" in code or f"from {module}" in code:
-                        raise ToolValidationError(
-                            tool_name,
-                            {"code": f"Use of module '{module}' is not allowed"},
-                            {"blocked_module": module}
-                        )
-                        
+            if "code" in parameters and validation.get("blocked_modules"):
+                module = self._find_blocked_module(validation, parameters["code"])
+                if module is not None:
+                    raise ToolValidationError(
+                        tool_name,
+                        {"code": f"Use of module '{module}' is not allowed"},
+                        {"blocked_module": module}
+                    )
+
             # Add more validation rules as needed
-            
+
         except Exception as e:
             if isinstance(e, ToolError):
                 raise
@@ -323,36 +422,21 @@ class ToolRegistry:
 tool_registry = ToolRegistry()
 
 def tool(function_type: str):
-    """Enhanced decorator for registering tools"""
+    """Decorator for registering tools.
+
+    Registers the function itself: execute_tool already converts
+    unexpected failures to ToolExecutionError, so the old per-tool
+    async wrapper only added a coroutine frame to every invocation
+    (plus a wraps metadata copy at import) to duplicate that handling.
+    """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            tool_name = func.__name__
-            try:
-                result = await func(*args, **kwargs)
-                return result
-                
-            except Exception as e:
-                if isinstance(e, ToolError):
-                    raise
-                raise ToolExecutionError(
-                    tool_name,
-                    "Tool execution failed",
-                    {
-                        "error": str(e),
-                        "args": args,
-                        "kwargs": kwargs
-                    }
-                )
-                
-        # Register with validation
         try:
-            return tool_registry.register_function(wrapper, function_type)
+            return tool_registry.register_function(func, function_type)
         except Exception as e:
             raise ToolConfigError(
                 func.__name__,
                 ["Failed to register tool"],
                 {"error": str(e)}
             )
-            
+
     return decorator
\ No newline at end of file
@@ -6,6 +6,78 @@ import re
 from typing import Optional, Dict, Any
 from .toolbox import tool
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Stop reading a page after this many bytes: caps memory per fetch and
+# skips parsing content we'd never feed to the LLM anyway
+_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+try:
+    # C parser; one tree walk replaces the pure-Python parse plus the
+    # per-tag decompose passes below
+    import lxml.html
+    from lxml.etree import strip_elements
+except ImportError:  # lxml not installed; BeautifulSoup path is used
+    lxml = None
+
+
+# Shared client so sequential fetches reuse pooled connections instead
+# of paying TCP+TLS setup per page. Created lazily, like the search
+# tool's DDGS instance, so importing the module stays side-effect free.
+_client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        headers = {"User-Agent": "Mozilla/5.0 (compatible; MyBot/1.0)"}
+        try:
+            # HTTP/2 multiplexes concurrent fetches over one connection,
+            # but needs the optional h2 package
+            _client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                headers=headers,
+                limits=limits
+            )
+        except ImportError:
+            _client = httpx.AsyncClient(
+                follow_redirects=True,
+                headers=headers,
+                limits=limits
+            )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the pooled HTTP connections on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _extract_text(content: bytes) -> str:
+    """Extract readable text from raw HTML bytes.
+
+    Prefers lxml: parse the bytes directly (no decode), strip the
+    non-content tags in C, and join the remaining text in a single
+    itertext pass. Falls back to the BeautifulSoup equivalent when
+    lxml isn't available.
+    """
+    if lxml is not None:
+        tree = lxml.html.fromstring(content)
+        strip_elements(tree, 'script', 'style', 'meta', 'noscript', with_tail=False)
+        return ' '.join(t.strip() for t in tree.itertext() if t.strip())
+
+    soup = BeautifulSoup(content, 'html.parser')
+    for element in soup(['script', 'style', 'meta', 'noscript']):
+        element.decompose()
+    # One C-level pass collapsing all whitespace runs, instead of
+    # splitting into a line list and stripping each in Python
+    return _WHITESPACE_RE.sub(' ', soup.get_text(separator=' ')).strip()
+
 
 class WebError(ToolError):
     """Web-specific errors"""
@@ -51,20 +123,16 @@ async def get_web_page(url: str, timeout: Optional[int] = 30) -> str:
                 details={"reason": "URL must start with http:// or https://"}
             )
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url,
-                    timeout=timeout,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (compatible; MyBot/1.0)"
-                    },
-                    follow_redirects=True
-                )
-                
+        client = _get_client()
+        try:
+            # Stream instead of buffering the whole body: headers are
+            # checked before any content is read, and the download stops
+            # at the size cap, so a huge or hostile page can't balloon
+            # memory. HTML parsers tolerate a truncated document.
+            async with client.stream('GET', url, timeout=timeout) as response:
                 # Check response
                 response.raise_for_status()
-                
+
                 # Validate content type
                 content_type = response.headers.get('content-type', '')
                 if not content_type.startswith('text/html'):
@@ -74,51 +142,51 @@ async def get_web_page(url: str, timeout: Optional[int] = 30) -> str:
                         response.status_code,
                         {"content_type": content_type}
                     )
-                
-                # Parse content
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove unwanted elements
-                for element in soup(['script', 'style', 'meta', 'noscript']):
-                    element.decompose()
-                
-                # Extract and clean text
-                text = ' '.join(
-                    line.strip()
-                    for line in soup.get_text(separator=' ').split('\n')
-                    if line.strip()
-                )
-                
-                if not text:
-                    raise WebError(
-                        "No text content found",
-                        url,
-                        response.status_code
-                    )
-                
-                return text
 
-            except httpx.TimeoutException:
-                raise WebError(
-                    "Request timed out",
-                    url,
-                    details={"timeout": timeout}
-                )
-                
-            except httpx.HTTPStatusError as e:
-                raise WebError(
-                    f"HTTP error occurred",
-                    url,
-                    e.response.status_code
-                )
-                
-            except httpx.HTTPError as e:
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes(64 * 1024):
+                    size += len(chunk)
+                    chunks.append(chunk)
+                    if size >= _MAX_BODY_BYTES:
+                        break
+                status_code = response.status_code
+
+            # Parse raw bytes: the parser handles charset detection,
+            # so we skip materializing a decoded string entirely
+            text = _extract_text(b''.join(chunks))
+
+            if not text:
                 raise WebError(
-                    "HTTP request failed",
+                    "No text content found",
                     url,
-                    details={"error": str(e)}
+                    status_code
                 )
-                
+
+            return text
+
+        except httpx.TimeoutException:
+            raise WebError(
+                "Request timed out",
+                url,
+                details={"timeout": timeout}
+            )
+
+        except httpx.HTTPStatusError as e:
+            raise WebError(
+                f"HTTP error occurred",
+                url,
+                e.response.status_code
+            )
+
+        except httpx.HTTPError as e:
+            raise WebError(
+                "HTTP request failed",
+                url,
+                details={"error": str(e)}
+            )
+
+
     except Exception as e:
         if isinstance(e, WebError):
             raise
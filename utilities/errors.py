@@ -3,6 +3,12 @@ from typing import Optional, Any, Dict, List
 
 class AppError(Exception):
     """Base error class for application"""
+    # Slots make message/code/details fixed-offset reads and document
+    # the attribute set. Note this does NOT drop the per-instance
+    # __dict__ — BaseException isn't slotted, so subclass instances
+    # always carry one regardless
+    __slots__ = ('message', 'code', 'details')
+
     def __init__(
         self,
         message: str,
@@ -16,11 +22,15 @@ class AppError(Exception):
 
 class ConfigError(AppError):
     """Configuration related errors"""
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(message, "CONFIG_ERROR", details)
 
 class ToolError(AppError):
     """Base class for tool-related errors"""
+    __slots__ = ()
+
     def __init__(
         self,
         message: str,
@@ -38,6 +48,8 @@ class ToolError(AppError):
 
 class ToolNotFoundError(ToolError):
     """Error when a requested tool doesn't exist"""
+    __slots__ = ()
+
     def __init__(self, tool_name: str):
         super().__init__(
             f"Tool not found: {tool_name}",
@@ -46,6 +58,8 @@ class ToolNotFoundError(ToolError):
 
 class ToolConfigError(ToolError):
     """Error in tool configuration"""
+    __slots__ = ()
+
     def __init__(
         self,
         tool_name: str,
@@ -63,6 +77,8 @@ class ToolConfigError(ToolError):
 
 class ToolExecutionError(ToolError):
     """Error during tool execution"""
+    __slots__ = ()
+
     def __init__(
         self,
         tool_name: str,
@@ -77,6 +93,8 @@ class ToolExecutionError(ToolError):
 
 class ToolValidationError(ToolError):
     """Error in tool parameter validation"""
+    __slots__ = ()
+
     def __init__(
         self,
         tool_name: str,
@@ -94,6 +112,8 @@ class ToolValidationError(ToolError):
 
 class LLMError(AppError):
     """Base class for LLM-related errors"""
+    __slots__ = ()
+
     def __init__(
         self, 
         message: str, 
@@ -103,6 +123,8 @@ class LLMError(AppError):
 
 class LLMConnectionError(LLMError):
     """Error when connecting to LLM service"""
+    __slots__ = ()
+
     def __init__(
         self, 
         message: str, 
@@ -119,6 +141,8 @@ class LLMConnectionError(LLMError):
 
 class LLMResponseError(LLMError):
     """Error when processing LLM response"""
+    __slots__ = ()
+
     def __init__(
         self, 
         message: str, 
@@ -137,6 +161,8 @@ class LLMResponseError(LLMError):
 
 class LLMValidationError(LLMError):
     """Error when validating LLM inputs or outputs"""
+    __slots__ = ()
+
     def __init__(
         self, 
         message: str, 